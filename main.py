@@ -1,9 +1,17 @@
+"""
+LLM Plus entry point.
+
+Run with --demo for the dependency-free consensus demo, or without flags to
+start the Google Sheets / Drive polling loop (requires credentials).
+"""
+
+import logging
 import sys
 import time
 import argparse
 from pathlib import Path
 from collections import Counter
-from typing import Any, Dict
+from typing import Any, Dict, Iterable
 
 # -------------------- Path setup (keep for now) --------------------
 ROOT = Path(__file__).parent
@@ -14,6 +22,11 @@ if str(SRC_DIR) not in sys.path:
 # -------------------- Safe type alias (no side effects) --------------------
 ClientDict = Dict[str, Any]
 
+# -------------------- Polling backoff --------------------
+POLL_INTERVAL_MIN = 0.5   # seconds between polls while work is flowing
+POLL_INTERVAL_MAX = 30.0  # cap while idle
+POLL_BACKOFF_FACTOR = 1.5
+
 # -------------------- REAL MODE LOOP --------------------
 def run_loop(clients: ClientDict):
     """
@@ -21,11 +34,11 @@ def run_loop(clients: ClientDict):
     All heavy imports are local to avoid side effects in demo mode.
     """
     from src.constants import CELL_REF_MAP
-    from src.orchestrator.state_machine import create_state_machine
+    from src.orchestrator.state_machine import create_state_machine, invalidate_control_panel
     from src.api.google.sheets import write_cell_value
 
     state_machine = create_state_machine(clients)
-    sheets = clients["sheets"]
+    sleep_s = POLL_INTERVAL_MIN
 
     while True:
         handler, state = state_machine()
@@ -33,13 +46,18 @@ def run_loop(clients: ClientDict):
 
         if handler.__name__ != "wait_handler":
             write_cell_value(
-                sheets,
+                clients["sheets"],
                 "finished",
                 "CONTROL_PANEL",
                 CELL_REF_MAP["toggle_button"],
             )
+            invalidate_control_panel()
+            sleep_s = POLL_INTERVAL_MIN
+        else:
+            # Idle or recovering from an APIError: back off to spare Sheets quota
+            sleep_s = min(sleep_s * POLL_BACKOFF_FACTOR, POLL_INTERVAL_MAX)
 
-        time.sleep(0.5)
+        time.sleep(sleep_s)
 
 # -------------------- REAL MODE ENTRY --------------------
 def run_real():
@@ -49,9 +67,38 @@ def run_real():
     """
     from src.api.auth import init_clients
 
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
     clients = init_clients()
     run_loop(clients)
 
+# -------------------- CONSENSUS --------------------
+def consensus(values: Iterable[Any]) -> Any:
+    """
+    Returns the majority-vote value among model outputs; ties go to the value
+    seen first. Uses numpy's vectorized unique/count when available so large
+    ensembles stay fast; falls back to Counter to keep demo mode
+    dependency-free and for None or mixed-type outputs numpy can't sort.
+    """
+    values = list(values)
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if np is not None and len({type(value) for value in values}) == 1:
+        array = np.asarray(values)
+        if array.dtype != object:
+            _, first_index, counts = np.unique(array, return_index=True, return_counts=True)
+            # np.unique sorts by value: rank by count, then by first occurrence
+            best = np.lexsort((first_index, -counts))[0]
+            return values[first_index[best]]
+
+    return Counter(values).most_common(1)[0][0]
+
 # -------------------- DEMO MODE (NO APIs) --------------------
 def run_demo():
     """
@@ -68,14 +115,14 @@ def run_demo():
         "DeepSeek": "41",
     }
 
-    consensus, _ = Counter(model_outputs.values()).most_common(1)[0]
+    result = consensus(model_outputs.values())
 
     print("\nLLM Plus — DEMO MODE\n")
     print("Simulated model outputs:")
     for name, output in model_outputs.items():
         print(f"  • {name}: {output}")
 
-    print(f"\nConsensus Result: {consensus}\n")
+    print(f"\nConsensus Result: {result}\n")
 
 # -------------------- CLI ENTRYPOINT --------------------
 def main():
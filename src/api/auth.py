@@ -1,76 +1,127 @@
-import openai
-import gspread
-from typing import TypedDict
-from googleapiclient.discovery import Resource
-from anthropic import Client
-import google.generativeai as genai
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, TypedDict
 from src.constants import GOOGLE_SCOPES
 
+# Provider SDKs are slow to import, so they are only imported for type checking
+# here and lazily inside each auth_* function (keeps --demo startup cheap).
+if TYPE_CHECKING:
+    import openai
+    import gspread
+    import google.generativeai as genai
+    from anthropic import Client
+    from googleapiclient.discovery import Resource
+
 class ClientDict(TypedDict):
-    gpt: openai.OpenAI
-    claude: Client
-    gemini: genai.GenerativeModel
-    sheets: gspread.Client
-    docs: Resource
-    drive: Resource
-
-def auth_gsheets() -> gspread.Client:
-    from pathlib import Path
+    gpt: "openai.OpenAI"
+    claude: "Client"
+    gemini: "genai.GenerativeModel"
+    sheets: "gspread.Client"
+    sheets_v4: "Resource"
+    docs: "Resource"
+    drive: "Resource"
+
+# Socket timeout (seconds) for Google discovery-client HTTP connections
+HTTP_TIMEOUT = 30
+
+# Move up two levels: src/api/auth.py → src → project root
+_CRED_PATH = str(Path(__file__).resolve().parents[2] / "credentials_demo.json")
+
+
+@lru_cache(maxsize=4)
+def _load_creds(cred_path: str, scopes: tuple):
+    """
+    Load service account credentials once per (path, scopes) pair so that
+    reauthentication does not re-read and re-parse the key file.
+    """
     from google.oauth2.service_account import Credentials
 
+    return Credentials.from_service_account_file(cred_path, scopes=list(scopes))
+
+
+# Per-thread connections for discovery calls made off the main thread
+_thread_state = threading.local()
+
+
+def _new_http():
+    """Build an authorized httplib2 connection with the service account credentials."""
+    import httplib2
+    from google_auth_httplib2 import AuthorizedHttp
+
+    creds = _load_creds(_CRED_PATH, tuple(GOOGLE_SCOPES))
+    return AuthorizedHttp(creds, http=httplib2.Http(cache=None, timeout=HTTP_TIMEOUT))
+
+
+@lru_cache(maxsize=1)
+def _shared_http():
+    """
+    Authorized httplib2 connection shared by every discovery client, so Drive,
+    Docs and Sheets v4 calls reuse one keep-alive connection pool instead of
+    renegotiating TLS per request.
+    """
+    return _new_http()
+
+
+def thread_http():
+    """
+    Authorized httplib2 connection owned by the calling thread. httplib2 is not
+    thread-safe, so requests executed from worker threads must use this instead
+    of the shared connection the discovery clients were built with.
+    """
+    http = getattr(_thread_state, "http", None)
+    if http is None:
+        http = _thread_state.http = _new_http()
+    return http
+
+
+@lru_cache(maxsize=4)
+def _build_service(service_name: str, version: str) -> "Resource":
+    """Build (and memoize) a Google API discovery client on the shared connection."""
+    from googleapiclient.discovery import build
+
+    http = _shared_http()
+    return build(service_name, version, http=http)
+
+
+def auth_gsheets() -> "gspread.Client":
     """
     Authenticate and return a gspread client using service account credentials.
     Looks for credentials_demo.json in the project root.
     """
-    # Move up two levels: src/services/auth.py → src → project root
-    root_path = Path(__file__).resolve().parents[2]
-    cred_path = root_path / "credentials_demo.json"
+    import gspread
 
-    creds = Credentials.from_service_account_file(
-        str(cred_path),
-        scopes=GOOGLE_SCOPES
-    )
+    creds = _load_creds(_CRED_PATH, tuple(GOOGLE_SCOPES))
 
     client = gspread.authorize(creds)
     return client
 
 
-def auth_docs():
-    from pathlib import Path
-    from google.oauth2.service_account import Credentials
-    from googleapiclient.discovery import build
-    from src.constants import GOOGLE_SCOPES
+def auth_sheets_v4():
+    """
+    Authenticate and return a Google Sheets v4 REST client using service account
+    credentials. Used for batched value reads that gspread does not expose.
+    """
+    return _build_service("sheets", "v4")
 
-    # same creds.json path logic as auth_drive()
-    root = Path(__file__).resolve().parents[2]
-    cred = root / "credentials_demo.json"
-    creds = Credentials.from_service_account_file(str(cred), scopes=GOOGLE_SCOPES)
-    return build("docs", "v1", credentials=creds)
 
-def auth_drive():
-    from pathlib import Path
-    from google.oauth2.service_account import Credentials
-    from googleapiclient.discovery import build
-    from src.constants import GOOGLE_SCOPES
+def auth_docs():
+    """
+    Authenticate and return a Google Docs client using service account credentials.
+    Looks for credentials_demo.json in the project root.
+    """
+    return _build_service("docs", "v1")
 
+def auth_drive():
     """
     Authenticate and return a Google Drive client using service account credentials.
     Looks for credentials_demo.json in the project root.
     """
-    # Move up two levels: src/services/auth.py → src → project root
-    root_path = Path(__file__).resolve().parents[2]
-    cred_path = root_path / "credentials_demo.json"
-
-    creds = Credentials.from_service_account_file(
-        str(cred_path),
-        scopes=GOOGLE_SCOPES
-    )
-
-    drive_client = build("drive", "v3", credentials=creds)
-    return drive_client
+    return _build_service("drive", "v3")
 
 def auth_gpt():
     import os
+    import openai
     from dotenv import load_dotenv
     # Load variables from .env file if it exists
     load_dotenv()
@@ -120,6 +171,7 @@ def init_clients() -> ClientDict:
         "claude": auth_claude(),
         "gemini": auth_gemini(),
         "sheets": auth_gsheets(),
+        "sheets_v4": auth_sheets_v4(),
         "docs": auth_docs(),
         "drive": auth_drive(),
     }
\ No newline at end of file
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from typing import List, Dict, Optional
 from googleapiclient.discovery import Resource
 from services.constants import DOCUMENT_ID
@@ -7,31 +8,30 @@ def write_to_docs(docs: Resource, ledger: List[Dict[str, Optional[str]]]) -> Non
     Writes each model’s outputs into the Google Doc specified by DOCUMENT_ID.
     Accepts ledger as List[Dict[str, Optional[str]]], where each entry is a dict
     mapping model names to that model’s latest output (which may be None).
+    Models within an entry that produced identical output are written once
+    under a combined heading.
     """
-    requests = []
-    # We'll insert newest entries at the top of the doc:
-    for entry in reversed(ledger):
+    parts = []
+    for entry in ledger:
+        # Models that agree verbatim share one heading and one body
+        models_by_output = defaultdict(list)
         for model, output in entry.items():
             if output is None:
                 continue  # Skip if no output from model
+            models_by_output[output].append(model)
 
-            # Insert model heading
-            requests.append({
-                "insertText": {
-                    "location": {"index": 1},
-                    "text": f"## Results from {model}\n\n"
-                }
-            })
-            # Insert model output
-            requests.append({
-                "insertText": {
-                    "location": {"index": 1},
-                    "text": output + "\n\n"
-                }
-            })
+        for output, models in models_by_output.items():
+            parts.append(f"## Results from {', '.join(models)}\n\n{output}\n\n")
 
-    if requests:
-        docs.documents().batchUpdate(
-            documentId=DOCUMENT_ID,
-            body={"requests": requests}
-        ).execute()
\ No newline at end of file
+    if not parts:
+        return
+
+    # Newest entries go at the top of the doc, so reverse once here and
+    # insert everything with a single request at index 1.
+    parts.reverse()
+    body = "".join(parts)
+
+    docs.documents().batchUpdate(
+        documentId=DOCUMENT_ID,
+        body={"requests": [{"insertText": {"location": {"index": 1}, "text": body}}]}
+    ).execute()
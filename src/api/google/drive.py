@@ -1,9 +1,106 @@
 from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Iterator, FrozenSet
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from googleapiclient.discovery import Resource
 from googleapiclient.http import MediaIoBaseDownload
+from src.api.auth import thread_http
 import re
 
+# Characters that are not safe in local filenames
+_UNSAFE = re.compile(r'[<>:"/\\|?*\u202f]')
+
+# Maximum number of names OR'ed together in a single Drive query
+NAME_QUERY_CHUNK_SIZE = 50
+
+# Maximum number of calls Drive accepts in a single batch HTTP request
+DRIVE_BATCH_LIMIT = 100
+
+# MIME types the model pipeline can consume
+SUPPORTED_TYPES = frozenset({
+    'application/pdf',
+    'image/jpeg',
+    'image/png',
+    'image/gif',
+    'image/webp'
+})
+
+# Concurrent downloads and bytes fetched per next_chunk() call
+DOWNLOAD_MAX_WORKERS = 8
+DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def _q_escape(value: str) -> str:
+    """Escape a string literal for use inside a Drive query (q=...)."""
+    return value.replace("\\", "\\\\").replace("'", "\\'")
+
+
+def _list_all_files(drive: Resource, query: str, fields: str, http=None) -> List[Dict[str, str]]:
+    """
+    Runs a files().list query and follows nextPageToken until every page is read.
+    
+    Args:
+        drive: Authenticated Google Drive API resource
+        query: Drive query string
+        fields: Comma-separated file fields to return (e.g. "id,name")
+        http: Connection to execute on (defaults to the resource's own)
+    
+    Returns:
+        List of file resource dicts
+    """
+    files = []
+    page_token = None
+    while True:
+        response = drive.files().list(
+            q=query,
+            fields=f"nextPageToken,files({fields})",
+            pageSize=1000,
+            pageToken=page_token
+        ).execute(http=http)
+        files.extend(response.get("files", []))
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return files
+
+
+def scan_uploads(
+    drive: Resource,
+    folder_id: str,
+    supported: FrozenSet[str] = SUPPORTED_TYPES
+) -> Iterator[Tuple[str, str, str, bool]]:
+    """
+    Lists all files in a specified folder in a single pass, flagging each one
+    as supported or not so callers can build download and archive queues
+    without re-walking the listing.
+    
+    Args:
+        drive: Authenticated Google Drive API resource
+        folder_id: ID of the folder to search in
+        supported: MIME types considered supported
+    
+    Yields:
+        Tuple of (file_id, name, mime_type, is_supported)
+    """
+    query = (
+        f"'{folder_id}' in parents "
+        "and trashed=false "
+        "and mimeType!='application/vnd.google-apps.folder'"
+    )
+    
+    # Idle polling usually finds an empty folder: probe with a one-id page
+    # first and only run the full listing when something is there
+    probe = drive.files().list(
+        q=query,
+        fields="files(id)",
+        pageSize=1
+    ).execute()
+    if not probe.get("files"):
+        return
+    
+    for file in _list_all_files(drive, query, "id,name,mimeType"):
+        mime_type = file["mimeType"]
+        yield file["id"], file["name"], mime_type, mime_type in supported
+
 
 def list_new_uploads(
     drive: Resource,
@@ -20,25 +117,11 @@ def list_new_uploads(
         Dictionary mapping file_id to tuple of (name, mime_type)
     """
     try:
-        query = (
-            f"'{folder_id}' in parents "
-            "and trashed=false "
-            "and mimeType!='application/vnd.google-apps.folder'"
-        )
-        
-        response = drive.files().list(
-            q=query,
-            fields="files(id,name,mimeType)"
-        ).execute()
-        
-        files = response.get("files", [])
-        result = {
-            file["id"]: (file["name"], file["mimeType"]) 
-            for file in files
+        return {
+            file_id: (name, mime_type)
+            for file_id, name, mime_type, _ in scan_uploads(drive, folder_id)
         }
         
-        return result
-        
     except Exception:
         return {}
 
@@ -57,15 +140,6 @@ def identify_illegal_file_formats(
         - Success boolean
         - Dictionary of invalid files (same format as input) or None if no invalid files
     """
-    # List of supported MIME types
-    SUPPORTED_TYPES = {
-        'application/pdf',
-        'image/jpeg',
-        'image/png',
-        'image/gif',
-        'image/webp'
-    }
-    
     invalid_files = {
         file_id: (name, mime_type)
         for file_id, (name, mime_type) in files.items()
@@ -95,22 +169,28 @@ def get_fileid_from_names(
         - Success boolean
     """
     try:
-        # Build query for all files at once
-        name_conditions = " or ".join(f"name = '{name}'" for name in filenames)
-        query = f"({name_conditions}) and '{folder_id}' in parents and trashed = false"
-        
-        result = drive.files().list(
-            q=query,
-            fields="files(id,name)"
-        ).execute()
-        
-        files = result.get("files", [])
-        
+        def list_chunk(chunk: List[str]) -> List[Dict[str, str]]:
+            name_conditions = " or ".join(f"name = '{_q_escape(name)}'" for name in chunk)
+            query = f"({name_conditions}) and '{folder_id}' in parents and trashed = false"
+            # Chunks run on worker threads, which must not share the
+            # resource's httplib2 connection
+            return _list_all_files(drive, query, "id,name", http=thread_http())
+
+        # Split into bounded chunks so the query string stays within Drive's limits
+        chunks = [
+            filenames[i:i + NAME_QUERY_CHUNK_SIZE]
+            for i in range(0, len(filenames), NAME_QUERY_CHUNK_SIZE)
+        ]
+        if len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(chunks), 8)) as executor:
+                chunk_results = list(executor.map(list_chunk, chunks))
+        else:
+            chunk_results = [list_chunk(chunk) for chunk in chunks]
+
+        files = [file for chunk_files in chunk_results for file in chunk_files]
+
         # Check for duplicates
-        name_count = {}
-        for file in files:
-            name_count[file["name"]] = name_count.get(file["name"], 0) + 1
-            
+        name_count = Counter(file["name"] for file in files)
         duplicates = [name for name, count in name_count.items() if count > 1]
         if duplicates:
             raise ValueError(f"Duplicate filenames found: {duplicates}")
@@ -119,7 +199,7 @@ def get_fileid_from_names(
         file_map = {file["name"]: file["id"] for file in files}
         
         # Verify all requested files were found
-        missing = set(filenames) - set(file_map.keys())
+        missing = set(filenames).difference(file_map)
         if missing:
             raise FileNotFoundError(f"Files not found: {missing}")
             
@@ -128,56 +208,72 @@ def get_fileid_from_names(
     except Exception:
         return {}
 
+def _local_paths(files: Dict[str, Tuple[str, str]], download_dir: Path) -> Dict[str, Path]:
+    """
+    Maps each file_id to a sanitized local path, suffixing " (n)" to names that
+    collide after sanitizing so concurrent downloads never share a file.
+    """
+    taken = set()
+    paths = {}
+    for file_id, (name, _) in files.items():
+        # The listing already scoped files to the uploads folder, so the name
+        # comes from there rather than a per-file metadata request
+        safe_name = _UNSAFE.sub('_', name)
+        stem, suffix = Path(safe_name).stem, Path(safe_name).suffix
+        n = 1
+        while safe_name in taken:
+            safe_name = f"{stem} ({n}){suffix}"
+            n += 1
+        taken.add(safe_name)
+        paths[file_id] = download_dir / safe_name
+    return paths
+
 def download_fileids_to_local(
     drive: Resource,
-    file_ids: List[str],
-    download_dir: Path,
-    source_folder_id: str
+    files: Dict[str, Tuple[str, str]],
+    download_dir: Path
 ) -> List[str]:
     """
     Downloads files by their IDs to a local directory.
     
     Args:
         drive: Authenticated Google Drive API resource
-        file_ids: List of file IDs to download
+        files: Dictionary mapping file_id to tuple of (name, mime_type), as
+               returned by list_new_uploads for the uploads folder
         download_dir: Path to download directory
-        source_folder_id: ID of the folder containing the files
     
     Returns:
         Tuple containing:
         - List of downloaded file paths (as strings)
         - Success boolean
     """
+    def download_one(file_id: str) -> str:
+        local_path = local_paths[file_id]
+        
+        # Download file on this worker's own connection (httplib2 is not
+        # thread-safe, and MediaIoBaseDownload uses request.http)
+        request = drive.files().get_media(fileId=file_id)
+        request.http = thread_http()
+        with local_path.open("wb") as f:
+            downloader = MediaIoBaseDownload(f, request, chunksize=DOWNLOAD_CHUNK_SIZE)
+            done = False
+            while not done:
+                _, done = downloader.next_chunk()
+                
+        return str(local_path)
+
     try:
         # Ensure download directory exists
         download_dir.mkdir(parents=True, exist_ok=True)
-        downloaded_paths = []
         
-        # Verify all files are in the source folder
-        for file_id in file_ids:
-            file = drive.files().get(
-                fileId=file_id,
-                fields="name,parents"
-            ).execute()
-            
-            if source_folder_id not in file.get("parents", []):
-                raise ValueError(f"File {file_id} not found in source folder")
-            
-            # Sanitize filename
-            safe_name = re.sub(r'[<>:"/\\|?*\u202f]', '_', file["name"])
-            local_path = download_dir / safe_name
-            
-            # Download file
-            request = drive.files().get_media(fileId=file_id)
-            with local_path.open("wb") as f:
-                downloader = MediaIoBaseDownload(f, request)
-                done = False
-                while not done:
-                    _, done = downloader.next_chunk()
-                    
-            downloaded_paths.append(str(local_path))
-            
-        return downloaded_paths
+        if not files:
+            return []
+        
+        local_paths = _local_paths(files, download_dir)
+        
+        # Downloads are independent and network-bound, so overlap them
+        with ThreadPoolExecutor(max_workers=min(len(files), DOWNLOAD_MAX_WORKERS)) as executor:
+            return list(executor.map(download_one, files))
         
     except Exception:
         return []
@@ -201,26 +297,28 @@ def relocate_fileids(
     Returns:
         Boolean indicating success
     """
+    errors = []
+
+    def on_response(request_id, response, exception):
+        if exception is not None:
+            errors.append((request_id, exception))
+
     try:
-        for file_id in file_ids:
-            # Verify file is in source folder
-            file = drive.files().get(
-                fileId=file_id,
-                fields="parents"
-            ).execute()
-            
-            if source_folder_id not in file.get("parents", []):
-                raise ValueError(f"File {file_id} not found in source folder")
-            
-            # Move file
-            drive.files().update(
-                fileId=file_id,
-                addParents=destination_folder_id,
-                removeParents=source_folder_id,
-                fields="id, parents"
-            ).execute()
-            
-        return True
+        # Drive accepts at most DRIVE_BATCH_LIMIT calls per batch request.
+        # removeParents makes Drive reject the move if the file is not in
+        # source_folder_id, so no separate parents lookup is needed.
+        for i in range(0, len(file_ids), DRIVE_BATCH_LIMIT):
+            batch = drive.new_batch_http_request(callback=on_response)
+            for file_id in file_ids[i:i + DRIVE_BATCH_LIMIT]:
+                batch.add(drive.files().update(
+                    fileId=file_id,
+                    addParents=destination_folder_id,
+                    removeParents=source_folder_id,
+                    fields="id, parents"
+                ))
+            batch.execute()
+
+        return not errors
         
     except Exception:
-        return False
\ No newline at end of file
+        return False
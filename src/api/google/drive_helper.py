@@ -1,9 +1,17 @@
 from pathlib import Path
 from typing import List, Tuple, Dict
+import re
 from googleapiclient.discovery import Resource
 from googleapiclient.http import MediaIoBaseDownload
 from constants import UPLOADS_FOLDER_ID, ARCHIVE_FOLDER_ID, DOWNLOAD_DIR
 
+# Characters that are not safe in local filenames
+_UNSAFE = re.compile(r'[<>:"/\\|?*\u202f]')
+
+def _q_escape(value: str) -> str:
+    """Escape a string literal for use inside a Drive query (q=...)."""
+    return value.replace("\\", "\\\\").replace("'", "\\'")
+
 def list_new_uploads(drive: Resource) -> list[dict]:
     """
     Queries Drive for all non-trashed, non-folder files in the UPLOADS_FOLDER_ID folder.
@@ -37,12 +45,10 @@ def download_file(drive: Resource, file_id: str, filename: str) -> Path:
     Returns:
         The full local path where the file was saved (Path object).
     """
-    import re
-    
     download_dir = Path(DOWNLOAD_DIR)
     download_dir.mkdir(parents=True, exist_ok=True)
 
-    safe_filename = re.sub(r'[<>:"/\\|?*\u202f]', '_', filename)
+    safe_filename = _UNSAFE.sub('_', filename)
     local_path = download_dir / safe_filename
     print(f"[DOWNLOAD] Preparing to download to: {local_path}")
 
@@ -114,7 +120,7 @@ def move_to_archive(drive: Resource, filenames: List[str]) -> None:
 
         try:
             query = (
-                f"name = '{filename}' and "
+                f"name = '{_q_escape(filename)}' and "
                 f"'{UPLOADS_FOLDER_ID}' in parents and "
                 "trashed = false"
             )
@@ -1,9 +1,108 @@
 import gspread
-from typing import List, Optional, Dict
+import logging
+import re
+from string import ascii_uppercase
+from functools import lru_cache
+from typing import Any, List, Optional, Dict, Tuple
 from gspread.exceptions import APIError, WorksheetNotFound
 from googleapiclient.errors import HttpError, Error
 from src.constants import OVERSEER_SHEET_ID as SHEET_ID
-from googleapiclient.discovery import Resource
+
+logger = logging.getLogger(__name__)
+
+# A1 cell reference split into column letters and row number
+_CELL_REF = re.compile(r'([A-Za-z]+)(\d+)')
+
+# Letters for 1-based columns A..ZZ (index 0 unused); wider columns are computed
+_COLUMN_LETTERS = ("",) + tuple(ascii_uppercase) + tuple(
+    first + second for first in ascii_uppercase for second in ascii_uppercase
+)
+
+# Resolved gspread handles, keyed by id(client). Each entry keeps the client
+# itself so a recycled id() after reauthentication can never match a stale one.
+_spreadsheets: Dict[Tuple[int, str], Tuple[gspread.Client, gspread.Spreadsheet]] = {}
+_worksheets: Dict[Tuple[int, str, str], Tuple[gspread.Client, gspread.Worksheet]] = {}
+
+def get_spreadsheet(client: gspread.Client, sheet_id: str) -> gspread.Spreadsheet:
+    """
+    Returns the Spreadsheet for sheet_id, opening it only on first use per client.
+    """
+    key = (id(client), sheet_id)
+    entry = _spreadsheets.get(key)
+    if entry is None or entry[0] is not client:
+        entry = _spreadsheets[key] = (client, client.open_by_key(sheet_id))
+    return entry[1]
+
+def get_worksheet(client: gspread.Client, sheet_id: str, sheet_tab: str) -> gspread.Worksheet:
+    """
+    Returns the Worksheet for sheet_tab, resolving it only on first use per client.
+    """
+    key = (id(client), sheet_id, sheet_tab)
+    entry = _worksheets.get(key)
+    if entry is None or entry[0] is not client:
+        worksheet = get_spreadsheet(client, sheet_id).worksheet(sheet_tab)
+        entry = _worksheets[key] = (client, worksheet)
+    return entry[1]
+
+def forget_handles(client: gspread.Client, sheet_id: str, sheet_tab: Optional[str] = None) -> None:
+    """
+    Drops cached handles after an API error so the next call re-resolves them
+    (e.g. the sheet or tab was deleted, renamed, or access was revoked).
+    """
+    _spreadsheets.pop((id(client), sheet_id), None)
+    if sheet_tab is not None:
+        _worksheets.pop((id(client), sheet_id, sheet_tab), None)
+
+def quote_tab(sheet_tab: str) -> str:
+    """Quotes a tab name for use in an A1 range (e.g. "Q&A" -> "'Q&A'")."""
+    return "'{}'".format(sheet_tab.replace("'", "''"))
+
+class BatchWriter:
+    """
+    Buffers writes to one spreadsheet and sends them in a single
+    values.batchUpdate call when the context exits cleanly (or on flush()).
+
+    Example:
+        with BatchWriter(client, sheet_id) as writer:
+            writer.write("LEDGER", "H3", "X")
+            writer.write_range("LEDGER", "B4:D4", [["4", "op", "inst"]])
+    """
+
+    def __init__(self, client: gspread.Client, sheet_id: str, value_input_option: str = "RAW"):
+        self._client = client
+        self._sheet_id = sheet_id
+        self._value_input_option = value_input_option
+        self._data: List[Dict[str, Any]] = []
+
+    def write(self, sheet_tab: str, cell: str, value: Any) -> None:
+        """Queues a single-cell write (cell is an A1 reference like 'C5')."""
+        self.write_range(sheet_tab, cell, [[value]])
+
+    def write_range(self, sheet_tab: str, a1_range: str, values: List[List[Any]]) -> None:
+        """Queues a 2D block of values for an A1 range like 'B4:D4'."""
+        self._data.append({"range": f"{quote_tab(sheet_tab)}!{a1_range}", "values": values})
+
+    def flush(self) -> None:
+        """Sends all queued writes in one request."""
+        if not self._data:
+            return
+        try:
+            get_spreadsheet(self._client, self._sheet_id).values_batch_update({
+                "valueInputOption": self._value_input_option,
+                "data": self._data,
+            })
+        except APIError:
+            forget_handles(self._client, self._sheet_id)
+            raise
+        self._data = []
+
+    def __enter__(self) -> "BatchWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is None:
+            self.flush()
+        return False
 
 def write_cell_value(
     client: gspread.Client,
@@ -28,16 +127,52 @@ def write_cell_value(
         APIError: For other API errors
     """
     try:
-        worksheet = client.open_by_key(sheet_id).worksheet(sheet_tab)
+        worksheet = get_worksheet(client, sheet_id, sheet_tab)
         worksheet.update_acell(cell, value)
-        print(f"✅ Wrote '{value}' to {sheet_tab}!{cell}")
+        logger.debug("Wrote '%s' to %s!%s", value, sheet_tab, cell)
     except WorksheetNotFound as e:
+        forget_handles(client, sheet_id, sheet_tab)
         raise WorksheetNotFound(f"Worksheet '{sheet_tab}' not found in sheet {sheet_id}") from e
     except HttpError as e:
         raise
     except APIError as e:
+        forget_handles(client, sheet_id, sheet_tab)
         raise APIError(f"Failed to write to cell {cell}: {str(e)}") from e
 
+def append_rows(
+    client: gspread.Client,
+    sheet_id: str,
+    sheet_tab: str,
+    a1_range: str,
+    rows: List[List[Any]],
+    value_input_option: str = "RAW",
+) -> int:
+    """
+    Appends rows below the last row of the table found in a1_range (e.g. 'B:D')
+    with a single values.append call, so callers don't need to scan for the
+    first free row.
+
+    Returns:
+        The 1-based sheet row the first appended row landed on.
+
+    Raises:
+        HttpError: For HTTP errors (400, 401, 403, 404, 429, 500, 503)
+        APIError: For other API errors
+    """
+    try:
+        response = get_spreadsheet(client, sheet_id).values_append(
+            f"{quote_tab(sheet_tab)}!{a1_range}",
+            params={"valueInputOption": value_input_option, "insertDataOption": "INSERT_ROWS"},
+            body={"values": rows},
+        )
+    except APIError as e:
+        forget_handles(client, sheet_id)
+        raise APIError(f"Failed to append {len(rows)} rows to '{sheet_tab}': {str(e)}") from e
+
+    # updatedRange looks like "'LEDGER'!B7:D9"
+    first_cell = response["updates"]["updatedRange"].rsplit("!", 1)[1].split(":")[0]
+    return int(_CELL_REF.match(first_cell).group(2))
+
 def load_entire_tab(
     client: gspread.Client,
     sheet_tab: str = "CONTROL_PANEL",
@@ -60,37 +195,27 @@ def load_entire_tab(
         APIError: For other API errors
     """
     try:
-        print(f"[DEBUG] Opening spreadsheet ID: {sheet_id}")
-        spreadsheet = client.open_by_key(sheet_id)
-
-        print(f"[DEBUG] Accessing tab: '{sheet_tab}'")
-        worksheet = spreadsheet.worksheet(sheet_tab)
+        logger.debug("Accessing tab '%s' in spreadsheet ID: %s", sheet_tab, sheet_id)
+        worksheet = get_worksheet(client, sheet_id, sheet_tab)
 
         # Get all values as strings
         data = worksheet.get_all_values()
-        
-        # Debug print the data structure
-        print(f"[DEBUG] Data type: {type(data)}")
-        print(f"[DEBUG] First row type: {type(data[0]) if data else 'No data'}")
-        print(f"[DEBUG] First cell type: {type(data[0][0]) if data and data[0] else 'No data'}")
-
-        row_count = len(data)
-        col_count = len(data[0]) if data else 0
-
-        print(f"[DEBUG] Loaded {row_count} rows and {col_count} columns from tab '{sheet_tab}'")
-        print("\n[DEBUG] Full tab data:")
-        print("-" * 50)
-        for i, row in enumerate(data):
-            print(f"Row {i+1}: {row}")
-        print("-" * 50)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            row_count = len(data)
+            col_count = len(data[0]) if data else 0
+            logger.debug("Loaded %d rows x %d cols from tab '%s'", row_count, col_count, sheet_tab)
+            logger.debug("Tab '%s' data=%r", sheet_tab, data)
 
         return data
 
     except WorksheetNotFound as e:
+        forget_handles(client, sheet_id, sheet_tab)
         raise WorksheetNotFound(f"Worksheet '{sheet_tab}' not found in sheet {sheet_id}") from e
     except HttpError as e:
         raise
     except APIError as e:
+        forget_handles(client, sheet_id, sheet_tab)
         raise APIError(f"Failed to load tab '{sheet_tab}': {str(e)}") from e
 
 def get_cell_value_from_2d_list(data: List[List[str]], cell: str) -> str:
@@ -99,33 +224,49 @@ def get_cell_value_from_2d_list(data: List[List[str]], cell: str) -> str:
     return the value at that cell.
     """
     # Convert cell like 'C1' to row/col indexes
-    col_letter = ''.join(filter(str.isalpha, cell)).upper()
-    row_number = int(''.join(filter(str.isdigit, cell)))
-
-    # Convert column letter(s) to 0-based index
-    col_index = 0
-    for i, char in enumerate(reversed(col_letter)):
-        col_index += (ord(char) - ord('A') + 1) * (26 ** i)
-    col_index -= 1  # 0-based
+    match = _CELL_REF.match(cell)
+    if not match:
+        raise ValueError(f"Invalid cell reference: {cell}")
 
-    # Row is also 0-based
-    row_index = row_number - 1
+    col_index = col_letter_to_index(match.group(1))
+    row_index = int(match.group(2)) - 1  # Row is also 0-based
 
     try:
         return data[row_index][col_index]
     except IndexError:
         raise ValueError(f"Cell {cell} is out of bounds in the provided data.")
 
+@lru_cache(maxsize=1024)
 def col_letter_to_index(col_letter: str) -> int:
     """
     Converts Excel-style column letter (e.g. 'A', 'B', ..., 'AA') to 0-based index.
     """
     col_letter = col_letter.upper()
+    length = len(col_letter)
+    # Fast paths for A-Z and AA-ZZ, which covers practically every sheet
+    if length == 1:
+        return ord(col_letter) - 65
+    if length == 2:
+        return (ord(col_letter[0]) - 64) * 26 + ord(col_letter[1]) - 65
+
     index = 0
-    for i, char in enumerate(reversed(col_letter)):
-        index += (ord(char) - ord('A') + 1) * (26 ** i)
+    for char in col_letter:
+        index = index * 26 + ord(char) - 64
     return index - 1  # convert to 0-based index
 
+def col_number_to_letter(col_number: int) -> str:
+    """
+    Converts a 1-based column number to its Excel-style letter(s) (1 -> 'A', 27 -> 'AA').
+    """
+    if 0 < col_number < len(_COLUMN_LETTERS):
+        return _COLUMN_LETTERS[col_number]
+
+    letters = ""
+    while col_number > 0:
+        col_number, remainder = divmod(col_number - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
 def get_column_after_row(
     data: List[List[str]],
     column_letter: str,
@@ -149,16 +290,41 @@ def get_column_after_row(
         if len(row) > col_index
     ]
 
-def get_sheet_tabs(client: gspread.Client, sheet_id: str) -> List[str]:
+class LazyTabs:
     """
-    Returns a list of tab (sheet) names for the given Google Sheet.
+    Dict-like view over a spreadsheet's tabs that downloads each tab on first
+    access and memoizes it, so callers that only touch a few tabs don't pay
+    for the whole workbook.
+
+    Indexing a missing tab raises WorksheetNotFound; get() returns the default instead.
     """
-    spreadsheet = client.open_by_key(sheet_id)
-    return [ws.title for ws in spreadsheet.worksheets()]
 
-def download_all_tabs(client: gspread.Client, sheet_id: str) -> Dict[str, list]:
+    def __init__(self, client: gspread.Client, sheet_id: str):
+        self._client = client
+        self._sheet_id = sheet_id
+        self._cache: Dict[str, List[List[str]]] = {}
+        self._missing: set = set()
+
+    def __getitem__(self, sheet_tab: str) -> List[List[str]]:
+        if sheet_tab in self._missing:
+            raise WorksheetNotFound(f"Worksheet '{sheet_tab}' not found in sheet {self._sheet_id}")
+        if sheet_tab not in self._cache:
+            try:
+                self._cache[sheet_tab] = load_entire_tab(self._client, sheet_tab, self._sheet_id)
+            except WorksheetNotFound:
+                self._missing.add(sheet_tab)
+                raise
+        return self._cache[sheet_tab]
+
+    def get(self, sheet_tab: str, default: Any = None) -> Any:
+        try:
+            return self[sheet_tab]
+        except WorksheetNotFound:
+            return default
+
+def download_all_tabs_lazy(client: gspread.Client, sheet_id: str) -> LazyTabs:
     """
-    Downloads all tabs from a Google Sheet and returns a dict of tab_name -> 2D list.
+    Returns a LazyTabs for the spreadsheet, which fetches tabs on first access
+    instead of downloading every tab up front.
     """
-    tab_names = get_sheet_tabs(client, sheet_id)
-    return {tab: load_entire_tab(client, tab, sheet_id) for tab in tab_names}
\ No newline at end of file
+    return LazyTabs(client, sheet_id)
@@ -1,17 +1,19 @@
 import os
 from pathlib import Path
+from types import MappingProxyType
 
 # ── Project root ───────────────────────────────────────────────────────────────
 # constants.py is in src/, so one level up is LLM-PLUS
 ROOT = Path(__file__).resolve().parents[1]
-print(f"DEBUG: __file__ = {__file__}")
-print(f"DEBUG: ROOT = {ROOT}")
 
 # ── Download directory ─────────────────────────────────────────────────────────
 # Use $DOWNLOAD_DIR if set, otherwise default to "<project root>/downloads"
 DOWNLOAD_DIR = Path(os.getenv("DOWNLOAD_DIR", ROOT / "downloads"))
-print(f"DEBUG: DOWNLOAD_DIR = {DOWNLOAD_DIR}")
-DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
+
+def ensure_download_dir() -> Path:
+    """Create DOWNLOAD_DIR on first use (rather than at import) and return it."""
+    DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    return DOWNLOAD_DIR
 
 # ── Google Sheets & Drive IDs ─────────────────────────────────────────────────
 OVERSEER_SHEET_ID  = "1yKUTzp94G3SJKqC22f1vunj_-6PrGIzkkV9k7vLPivw"
@@ -29,8 +31,14 @@ GOOGLE_SCOPES = [
     "https://www.googleapis.com/auth/documents"  # for Google Docs
 ]
 
+# ── Ledger model columns ───────────────────────────────────────────────────────
+# Each evaluation step spans 4 ledger columns, one per model, in this order
+MODEL_ORDER = ("CLAUDE", "DEEPSEEK", "GEMINI", "GPT")
+MODEL_OFFSET = MappingProxyType({model: i for i, model in enumerate(MODEL_ORDER)})
+
 # Mapping of cell addresses to their logical meaning in the control panel
-SHEET_CELL_MAP = {
+# (read-only views, so no caller can mutate the shared maps)
+SHEET_CELL_MAP = MappingProxyType({
     "C1": "system_state",
     "C2": "last_check_time",
     "C8": "toggle_button",           # Toggle Button (start/stop)
@@ -39,7 +47,7 @@ SHEET_CELL_MAP = {
     "C11": "run_duration_hours",    # Run Duration (Hours)
     "C12": "computer_vision_mode",  # Computer Vision Mode
     # Add more if needed for other settings
-}
+})
 
 # Reverse mapping for getting cell references
-CELL_REF_MAP = {v: k for k, v in SHEET_CELL_MAP.items()}
\ No newline at end of file
+CELL_REF_MAP = MappingProxyType({v: k for k, v in SHEET_CELL_MAP.items()})
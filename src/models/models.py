@@ -1,10 +1,12 @@
 # src/services/models.py
 import base64
-import mimetypes
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence
 from PIL import Image
-import fitz  # PyMuPDF for PDF processing
 
 # For GPT:
 import openai
@@ -15,13 +17,49 @@ import google.generativeai as genai
 # For Claude:
 from anthropic import Anthropic
 
+from src.models.pdf import extract_text_cached
+
 from pathlib import Path
 from typing import List, Dict
 
+_IMG_MIME = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+_IMG_EXTS = frozenset(_IMG_MIME)
+
+
+@lru_cache(maxsize=8)
+def _encode_image_cached(image_path: str, mtime: float) -> str:
+    """Base64-encode a file through a read-only mmap, avoiding an intermediate bytes copy."""
+    with open(image_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return base64.b64encode(mm).decode("ascii")
+
+
+def _encode_image(path: Path) -> str:
+    """
+    Returns the base64 encoding of an image, cached per (path, mtime) since the
+    same image is usually sent to more than one provider.
+    call_models_concurrently clears the cache once a row's calls are done.
+    """
+    return _encode_image_cached(str(path.resolve()), path.stat().st_mtime)
+
+
 def extract_pdf_text(pdf_path: Path) -> str:
     """
     Extract text from PDF using PyMuPDF.
     
+    Large documents are split into page ranges and extracted in worker
+    processes, each with its own document handle (PyMuPDF objects cannot be
+    shared across threads). Results are cached per (path, mtime), so the
+    same attachment sent to several models is only extracted once.
+    
     Args:
         pdf_path: Path to PDF file
         
@@ -29,13 +67,8 @@ def extract_pdf_text(pdf_path: Path) -> str:
         Extracted text as string
     """
     try:
-        doc = fitz.open(pdf_path)
-        text = ""
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            text += page.get_text()
-        doc.close()
-        return text
+        path = Path(pdf_path)
+        return extract_text_cached(str(path.resolve()), path.stat().st_mtime)
     except Exception as e:
         print(f"❌ Failed to extract text from PDF {pdf_path}: {e}")
         return ""
@@ -86,6 +119,65 @@ def call_models(
     except Exception as e:
         return f"[Model call error: {e}]"
 
+def _prepare_attachments(files: List[str]) -> None:
+    """
+    Extracts PDFs and encodes images on the calling thread so the per-model
+    calls fanned out afterwards all hit the caches. lru_cache does not merge
+    concurrent misses, so without this each model would extract the same file.
+    """
+    for file in files:
+        path = Path(file)
+        ext = path.suffix.lower()
+        try:
+            if ext == ".pdf":
+                extract_pdf_text(path)
+            elif ext in _IMG_EXTS:
+                _encode_image(path)
+        except Exception:
+            # The per-model call reports the failure in its own output
+            pass
+
+def call_models_concurrently(
+    clients: Dict[str, Any],
+    model_strings: Sequence[str],
+    prompt: str,
+    question: str,
+    files: List[str],
+) -> Dict[str, str]:
+    """
+    Calls several models concurrently, one call_models per model on its own
+    thread, so wall time is the slowest provider rather than the sum.
+    
+    Args:
+        clients: Dict with keys 'gpt', 'gemini', 'claude' and client objects
+        model_strings: Models to query, e.g. ['gpt-4o', 'claude-3-sonnet']
+        prompt: Prompt string
+        question: Additional question string
+        files: List of file paths (strings)
+
+    Returns:
+        Dict of model string -> output (or error message), in the order of
+        model_strings
+    """
+    _prepare_attachments(files)
+
+    with ThreadPoolExecutor(max_workers=len(model_strings)) as executor:
+        futures = {
+            model_string: executor.submit(call_models, clients, model_string, prompt, question, files)
+            for model_string in model_strings
+        }
+    # Every call has finished with the images; don't hold their base64 text
+    # (often megabytes each) until the next row evicts it
+    _encode_image_cached.cache_clear()
+
+    model_results = {}
+    for model_string, future in futures.items():
+        try:
+            model_results[model_string] = future.result()
+        except Exception as e:
+            model_results[model_string] = f"[Error: {e}]"
+    return model_results
+
 def call_gpt_model(
     client: Any,
     model_string: str,
@@ -145,16 +237,13 @@ def call_gpt_model(
                     except Exception as e:
                         print(f"❌ Failed to process PDF {path}: {e}")
                         messages.append({"role": "user", "content": f"[Failed to process PDF: {path.name}]"})
-                elif ext in [".png", ".jpg", ".jpeg", ".gif", ".webp"]:
+                elif ext in _IMG_EXTS:
                     try:
                         # For images, encode as base64
-                        with open(path, "rb") as image_file:
-                            image_data = base64.b64encode(image_file.read()).decode('utf-8')
+                        image_data = _encode_image(path)
                         
                         # Determine MIME type
-                        mime_type, _ = mimetypes.guess_type(str(path))
-                        if not mime_type or not mime_type.startswith('image/'):
-                            mime_type = f"image/{ext[1:]}"
+                        mime_type = _IMG_MIME[ext]
                         
                         # Add image with proper vision format
                         messages.append({
@@ -237,7 +326,7 @@ def call_gemini_model(
             ext = path.suffix.lower()
             print(f"🔄 Processing Gemini attachment: {path} (type: {ext})")
             
-            if ext in [".png", ".jpg", ".jpeg", ".gif", ".webp"]:
+            if ext in _IMG_EXTS:
                 try:
                     # For images, use PIL to open and add to content
                     image = Image.open(path)
@@ -355,16 +444,13 @@ def call_claude_model(
                     content.append({"type": "text", "text": f"\n\n(Failed to process PDF at {path}: {e})"})
                     print(f"❌ PDF processing failed: {e}")
                     
-            elif ext in [".png", ".jpg", ".jpeg", ".gif", ".webp"]:
+            elif ext in _IMG_EXTS:
                 try:
                     # Read and encode the image
-                    with open(path, "rb") as image_file:
-                        image_data = base64.b64encode(image_file.read()).decode('utf-8')
+                    image_data = _encode_image(path)
                     
                     # Determine MIME type
-                    mime_type, _ = mimetypes.guess_type(str(path))
-                    if not mime_type or not mime_type.startswith('image/'):
-                        mime_type = f"image/{ext[1:]}"  # Remove the dot from extension
+                    mime_type = _IMG_MIME[ext]
                     
                     # Add image to content
                     content.append({
@@ -0,0 +1,48 @@
+# src/models/pdf.py
+#
+# PDF text extraction. Kept free of the model SDK imports in models.py: the
+# extraction workers are spawned, and each one imports this module afresh.
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import get_context
+
+import fitz  # PyMuPDF for PDF processing
+
+# Spawning a worker and importing PyMuPDF costs on the order of 100 ms, while
+# get_text() takes a few ms per page, so a worker only pays for itself with
+# a few dozen pages to chew through. Below PDF_PARALLEL_MIN_PAGES the whole
+# document is read in-process.
+PDF_PARALLEL_MIN_PAGES = 256
+PDF_MIN_PAGES_PER_WORKER = 64
+PDF_MAX_WORKERS = os.cpu_count() or 1
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> str:
+    """Extract text from pages [start, stop) using a document handle private to this worker."""
+    doc = fitz.open(pdf_path)
+    try:
+        return "".join(doc.load_page(i).get_text() for i in range(start, stop))
+    finally:
+        doc.close()
+
+
+@lru_cache(maxsize=32)
+def extract_text_cached(pdf_path: str, mtime: float) -> str:
+    """Extract a PDF's text; keyed on mtime so an overwritten file is re-read."""
+    doc = fitz.open(pdf_path)
+    try:
+        page_count = doc.page_count
+        workers = min(PDF_MAX_WORKERS, page_count // PDF_MIN_PAGES_PER_WORKER)
+        if page_count < PDF_PARALLEL_MIN_PAGES or workers < 2:
+            return "".join([page.get_text() for page in doc.pages()])
+    finally:
+        doc.close()
+
+    step = -(-page_count // workers)
+    bounds = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    # Spawn rather than fork: callers are multi-threaded, and forking a
+    # threaded process can deadlock the children
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as ex:
+        parts = ex.map(_extract_page_range, [pdf_path] * len(bounds), *zip(*bounds))
+        return "".join(parts)
@@ -1,37 +1,46 @@
-from typing import Dict, Any
+import logging
+from typing import Dict, Optional, Union
 from src.api.auth import ClientDict
-from src.api.google.sheets import download_all_tabs
+from src.orchestrator.state_machine import HandlerData
+from src.api.google.sheets import LazyTabs, download_all_tabs_lazy
 import time
 from pathlib import Path
 
-def process_uploads_handler(data: Dict[str, Any], clients: ClientDict) -> None:
+logger = logging.getLogger(__name__)
+
+def process_uploads_handler(data: HandlerData, clients: ClientDict) -> None:
     """Handle processing uploaded files"""
-    from src.processes.template import print_input_from_json, find_next_row_number
+    from src.processes.template import append_input_from_json
     from src.processes.processor import read_input, save_final_output_to_json
     from src.processes.present import parse_present_tab
     from src.api.google.drive import (
-        list_new_uploads, 
+        scan_uploads, 
         download_fileids_to_local, 
         relocate_fileids,
         get_fileid_from_names
     )
-    from src.constants import UPLOADS_FOLDER_ID, DOWNLOAD_DIR, ARCHIVE_FOLDER_ID, TEMPLATES_FOLDER_ID
-    
-    print(f"📤 Processing uploads with state: {data}")
-    # Get list of files in uploads folder
-    files = list_new_uploads(clients["drive"], UPLOADS_FOLDER_ID)
-
-    # Extract file IDs
-    file_ids = list(files.keys())  # Extract keys (file IDs) from the dict
+    from src.constants import UPLOADS_FOLDER_ID, ARCHIVE_FOLDER_ID, TEMPLATES_FOLDER_ID, ensure_download_dir
+    
+    logger.info("Processing uploads with state: %s", data)
+    # Single pass over the uploads folder: supported files are queued for
+    # download, every file is queued for archiving
+    to_download = {}
+    file_ids = []
+    for file_id, name, mime_type, is_supported in scan_uploads(clients["drive"], UPLOADS_FOLDER_ID):
+        file_ids.append(file_id)
+        if is_supported:
+            to_download[file_id] = (name, mime_type)
+        else:
+            logger.info("Skipping unsupported file '%s' (%s)", name, mime_type)
 
-    print(f"File IDs: {file_ids}")
+    logger.debug("File IDs: %s", file_ids)
     
     # Download files to local directory
+    download_dir = ensure_download_dir()
     downloaded_paths = download_fileids_to_local(
         drive=clients["drive"],
-        file_ids=file_ids,
-        download_dir=Path(DOWNLOAD_DIR),
-        source_folder_id=UPLOADS_FOLDER_ID
+        files=to_download,
+        download_dir=download_dir
     )
     
     # Move files to archive
@@ -43,16 +52,16 @@ def process_uploads_handler(data: Dict[str, Any], clients: ClientDict) -> None:
     )
     
     if not success:
-        print("Warning: Failed to move some files to archive")
+        logger.warning("Failed to move some files to archive")
     
-    print(f"Downloaded {len(downloaded_paths)} files: {downloaded_paths}")
+    logger.info("Downloaded %d files: %s", len(downloaded_paths), downloaded_paths)
     
     # Get template file ID
-    fileid_map = get_fileid_from_names(clients["drive"], [data["template_file"]], TEMPLATES_FOLDER_ID)
-    template_fileid = fileid_map[data["template_file"]]
+    fileid_map = get_fileid_from_names(clients["drive"], [data.template_file], TEMPLATES_FOLDER_ID)
+    template_fileid = fileid_map[data.template_file]
     
-    # Get all tabs from template
-    all_tabs = download_all_tabs(clients["sheets"], template_fileid)
+    # Tabs are fetched on first access; only the ones actually read are downloaded
+    all_tabs = download_all_tabs_lazy(clients["sheets"], template_fileid)
     
     # Get CV present tab
     cv_present = parse_present_tab(all_tabs.get("CV_PRESENT", []))
@@ -61,33 +70,41 @@ def process_uploads_handler(data: Dict[str, Any], clients: ClientDict) -> None:
     results = read_input(clients, cv_present, downloaded_paths)
 
     # Save results to JSON
-    output_path = Path(DOWNLOAD_DIR) / "model_output.json"
+    output_path = download_dir / "model_output.json"
     save_final_output_to_json(results, str(output_path))
-    print(f"💾 Saved model output to: {output_path}")
+    logger.info("Saved model output to: %s", output_path)
 
-    # Get next row number and print to sheets
-    next_row = find_next_row_number(all_tabs.get("LEDGER", []))
-    print(f"📊 Next row number in sheet: {next_row}")
-    print_input_from_json(clients["sheets"], str(output_path), next_row, template_fileid)
+    # Append the new questions below the last ledger row
+    first_row = append_input_from_json(clients["sheets"], str(output_path), template_fileid)
+    logger.info("Appended new questions starting at sheet row: %s", first_row)
 
-    # Call process_ledger_handler
-    process_ledger_handler(data, clients)
+    # LEDGER hasn't been fetched in full yet, so the ledger handler will load
+    # it with the new question rows; every other fetched tab is shared
+    process_ledger_handler(data, clients, all_tabs=all_tabs, template_fileid=template_fileid)
     
     return
 
-def process_ledger_handler(data: Dict[str, Any], clients: ClientDict) -> None:
+def process_ledger_handler(
+    data: HandlerData,
+    clients: ClientDict,
+    all_tabs: Optional[Union[LazyTabs, Dict[str, list]]] = None,
+    template_fileid: Optional[str] = None,
+) -> None:
     """
     Handles the processing of ledger data, including downloading tabs, evaluating questions,
     and writing results back to the sheet.
     
     Args:
-        data: Dictionary containing the request data
+        data: Run configuration from the control panel
         clients: Dictionary of client instances
+        all_tabs: Template tabs from the caller (loaded lazily here if None)
+        template_fileid: Drive file ID of the template (looked up here if None)
     """
     from src.processes.processor import evaluate_row
     from src.utils.json import (
         serialize_ledger_into_json, 
         update_question_inside_json, 
+        flush_questions,
         read_json_file, 
     )
     from src.processes.template import print_output_from_json
@@ -97,17 +114,19 @@ def process_ledger_handler(data: Dict[str, Any], clients: ClientDict) -> None:
     from src.api.google.drive import get_fileid_from_names
     from src.constants import TEMPLATES_FOLDER_ID
     
-    print(f"📝 Processing ledger with state: {data}")
+    logger.info("Processing ledger with state: %s", data)
     
     # Get template file ID
-    fileid_map = get_fileid_from_names(clients["drive"], [data["template_file"]], TEMPLATES_FOLDER_ID)
-    template_fileid = fileid_map[data["template_file"]]
+    if template_fileid is None:
+        fileid_map = get_fileid_from_names(clients["drive"], [data.template_file], TEMPLATES_FOLDER_ID)
+        template_fileid = fileid_map[data.template_file]
     
-    # Download all tabs from the template file
-    all_tabs = download_all_tabs(clients["sheets"], template_fileid)
+    # Only LEDGER and the present tabs referenced by questions are fetched
+    if all_tabs is None:
+        all_tabs = download_all_tabs_lazy(clients["sheets"], template_fileid)
     
     # Extract the LEDGER tab and save to JSON
-    timestamp_str = data["timestamp"]
+    timestamp_str = data.timestamp
     serialize_ledger_into_json(all_tabs.get("LEDGER", []), convert_timestamp_to_safe_format(timestamp_str))
     
     # Convert timestamp to filesystem-safe format
@@ -116,62 +135,66 @@ def process_ledger_handler(data: Dict[str, Any], clients: ClientDict) -> None:
     # Read questions from JSON file
     json_file = Path("outputs") / f"{safe_timestamp}.json"
     questions = read_json_file(json_file)
-    print(f"Questions from JSON: {questions}")
+    logger.debug("Questions from JSON: %s", questions)
     
     # Initialize presents dictionary to cache loaded presents
     presents = {}
     
-    # Process each question in priority order
-    for question in questions:
-        present_name = question['present']
+    # Process each question in priority order. Flush in finally so results
+    # already gathered reach the JSON file even if a later question fails.
+    try:
+        for question in questions:
+            present_name = question['present']
 
-        if question['resolved']:
-            continue
+            if question['resolved']:
+                continue
 
-        if question['reload_question']:
-            print(f"Reloading question {question['question_number']}")
-            # TODO: Reload the question
-            continue
+            if question['reload_question']:
+                logger.debug("Reloading question %s", question['question_number'])
+                # TODO: Reload the question
+                continue
         
-        # Load present if not already loaded
-        if present_name not in presents:
-            present_tab = all_tabs.get(present_name, [])
-            if not present_tab:
-                print(f"Warning: Present tab '{present_name}' not found, using 'TEST_PRESENT'.")
-                present_name = "TEST_PRESENT"
+            # Load present if not already loaded
+            if present_name not in presents:
                 present_tab = all_tabs.get(present_name, [])
                 if not present_tab:
-                    print(f"Warning: Present tab '{present_name}' not found, using 'TEST_PRESENT'.")
-                    continue
-            presents[present_name] = parse_present_tab(present_tab)
+                    logger.warning("Present tab '%s' not found, using 'TEST_PRESENT'.", present_name)
+                    present_name = "TEST_PRESENT"
+                    present_tab = all_tabs.get(present_name, [])
+                    if not present_tab:
+                        logger.warning("Fallback present tab '%s' not found, skipping question.", present_name)
+                        continue
+                presents[present_name] = parse_present_tab(present_tab)
         
-        # Evaluate the present with the question
-        eval_results = evaluate_row(
-            presents[present_name],
-            question['question'],
-            clients,
-        )
-        print(f"[DEBUG] Results for question {question['question_number']}: {eval_results}")
+            # Evaluate the present with the question
+            eval_results = evaluate_row(
+                presents[present_name],
+                question['question'],
+                clients,
+            )
+            logger.debug("Results for question %s: %s", question['question_number'], eval_results)
         
-        # Update question in JSON with results
-        question['model_outputs'] = eval_results
-        question['resolved'] = True
-        update_question_inside_json(question, convert_timestamp_to_safe_format(data["timestamp"]))
+            # Update question in JSON with results
+            question['model_outputs'] = eval_results
+            question['resolved'] = True
+            update_question_inside_json(question, safe_timestamp)
+    finally:
+        flush_questions(safe_timestamp)
     
     # Write all results back to sheets
     print_output_from_json(clients["sheets"], str(json_file), template_fileid)
     
     return
 
-def wait_for_uploads_handler(data: Dict[str, Any], clients: ClientDict) -> None:
+def wait_for_uploads_handler(data: Optional[HandlerData], clients: ClientDict) -> None:
     """Handle waiting for new uploads"""
-    print(f"⏳ Waiting for uploads with state: {data}")
+    logger.info("Waiting for uploads with state: %s", data)
     if watchtower(clients["drive"]):
         return
     return
 
-def wait_handler(data: Dict[str, Any], clients: ClientDict) -> None:
+def wait_handler(data: Optional[HandlerData], clients: ClientDict) -> None:
     """Handle waiting state"""
-    print(f"⏳ Waiting for system to be ready...")
+    logger.info("Waiting for system to be ready...")
     time.sleep(10)
     return
\ No newline at end of file
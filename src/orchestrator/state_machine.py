@@ -1,64 +1,129 @@
-from typing import Dict, Callable, Any
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Callable, Optional
 from functools import partial
 from src.api.auth import ClientDict
 import gspread
+import time
 from gspread.exceptions import APIError
+from googleapiclient.errors import HttpError
 
-def get_cell_value(data: list, cell: str) -> str:
-    """Get value from cell reference (e.g. 'C7') in sheet data"""
-    col = ord(cell[0]) - ord('A')  # Convert 'A' to 0, 'B' to 1, etc.
-    row = int(cell[1:]) - 1        # Convert '7' to 6 (0-based index)
-    return data[row][col]
+# Control panel cells read on every poll
+CONTROL_PANEL_FIELDS = (
+    "toggle_button",
+    "template_file_name",
+    "run_mode",
+    "run_duration_hours",
+)
 
-def get_state(clients: ClientDict) -> Dict[str, Any]:
-    """Read state flags and run configuration from control panel"""
-    from src.api.google.sheets import load_entire_tab
+# Force a control panel reload after this many seconds even if Drive still
+# reports the same modifiedTime (Drive metadata can lag behind Sheets edits)
+CONTROL_PANEL_CACHE_TTL = 30.0
+
+@dataclass(slots=True, frozen=True)
+class HandlerData:
+    """Run configuration read from the control panel, passed to each handler."""
+    start_flag: bool
+    template_file: str
+    run_mode: str
+    run_duration: Optional[int]
+    timestamp: datetime
+
+_last_mtime: Optional[str] = None
+_last_values: Optional[Dict[str, str]] = None
+_last_loaded_at: float = 0.0
+
+def read_control_panel(clients: ClientDict) -> Dict[str, str]:
+    """
+    Fetch only the CONTROL_PANEL_FIELDS cells with a single values.batchGet call.
+    Returns a dict of field name -> cell value ("" for empty cells).
+    """
     from src.constants import OVERSEER_SHEET_ID, CELL_REF_MAP
+
+    response = clients["sheets_v4"].spreadsheets().values().batchGet(
+        spreadsheetId=OVERSEER_SHEET_ID,
+        ranges=[f"CONTROL_PANEL!{CELL_REF_MAP[name]}" for name in CONTROL_PANEL_FIELDS]
+    ).execute()
+
+    values = {}
+    for name, value_range in zip(CONTROL_PANEL_FIELDS, response.get("valueRanges", [])):
+        # Empty cells come back without a "values" key
+        rows = value_range.get("values", [])
+        values[name] = rows[0][0] if rows and rows[0] else ""
+    return values
+
+def load_control_panel(clients: ClientDict) -> Dict[str, str]:
+    """
+    Return the control panel values, re-reading them only when the spreadsheet's
+    Drive modifiedTime has changed or the cached copy is older than
+    CONTROL_PANEL_CACHE_TTL seconds.
+    """
+    from src.constants import OVERSEER_SHEET_ID
+
+    global _last_mtime, _last_values, _last_loaded_at
+
+    now = time.monotonic()
+    if _last_values is None or now - _last_loaded_at >= CONTROL_PANEL_CACHE_TTL:
+        # Expired: a reload is due regardless of modifiedTime, so skip the
+        # Drive probe. Keeping the older _last_mtime is safe: it was observed
+        # before this read, so a later match still means nothing changed.
+        _last_values = read_control_panel(clients)
+        _last_loaded_at = now
+        return _last_values
+
+    meta = clients["drive"].files().get(
+        fileId=OVERSEER_SHEET_ID,
+        fields="modifiedTime"
+    ).execute()
+    mtime = meta.get("modifiedTime")
+    if mtime == _last_mtime:
+        return _last_values
+
+    _last_values = read_control_panel(clients)
+    _last_mtime = mtime
+    _last_loaded_at = now
+    return _last_values
+
+def invalidate_control_panel() -> None:
+    """
+    Drop the cached control panel values so the next load re-reads them, e.g.
+    after writing the toggle cell ourselves (Drive's modifiedTime can lag it).
+    """
+    global _last_values
+
+    _last_values = None
+
+def get_state(clients: ClientDict) -> Optional[HandlerData]:
+    """Read state flags and run configuration from control panel"""
     from src.utils.timer import get_current_time
     
-    sheets = clients["sheets"]
-    
-    # Load entire control panel tab
-    data = load_entire_tab(
-        client=sheets,
-        sheet_id=OVERSEER_SHEET_ID,
-        sheet_tab="CONTROL_PANEL"
-    )
+    # Load control panel values (cached between polls while unchanged)
+    values = load_control_panel(clients)
     
     # Check if system is ready
-    toggle_value = get_cell_value(data, CELL_REF_MAP["toggle_button"])
+    toggle_value = values["toggle_button"]
     if toggle_value != "start":
         return None
     
-    # Extract values using CELL_REF_MAP
-    run_mode = get_cell_value(
-        data, 
-        CELL_REF_MAP["run_mode"]
-    )
+    run_mode = values["run_mode"]
     
-    state = {
-        "start_flag": toggle_value == "start",  # Set based on toggle value
-        "template_file": get_cell_value(
-            data, 
-            CELL_REF_MAP["template_file_name"]
-        ),
+    state = HandlerData(
+        start_flag=toggle_value == "start",  # Set based on toggle value
+        template_file=values["template_file_name"],
         
-        "run_mode": run_mode,
+        run_mode=run_mode,
         
-        "run_duration": (
-            int(get_cell_value(
-                data, 
-                CELL_REF_MAP["run_duration_hours"]
-            ))
+        run_duration=(
+            int(values["run_duration_hours"])
             if run_mode == "wait_for_uploads" 
             else None
         ),
-        "timestamp": get_current_time(),
-    }
+        timestamp=get_current_time(),
+    )
     
     return state
 
-def create_state_machine(clients: ClientDict) -> Callable[[], tuple[Callable, dict]]:
+def create_state_machine(clients: ClientDict) -> Callable[[], tuple[Callable, Optional[HandlerData]]]:
     from src.orchestrator.handlers import (
         process_uploads_handler,
         process_ledger_handler,
@@ -73,17 +138,17 @@ def create_state_machine(clients: ClientDict) -> Callable[[], tuple[Callable, di
     }
 
     def run_state_machine():
-        from gspread.exceptions import APIError
         from src.api.auth import auth_gsheets
 
         try:
             state = get_state(clients)
-            mode = state["run_mode"] if state else "waiting"
+            mode = state.run_mode if state else "waiting"
             handler = HANDLER_MAP.get(mode, wait_handler)
-            return handler, (state or {})
-        except APIError as e:
+            return handler, state
+        except (APIError, HttpError) as e:
             print(f"API Error: {e}. Reauthenticating...")
-            auth_gsheets(clients)
-            return wait_handler, {}
+            clients["sheets"] = auth_gsheets()
+            # wait_handler makes run_loop back off before the next poll
+            return wait_handler, None
 
     return run_state_machine
\ No newline at end of file
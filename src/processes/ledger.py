@@ -1,50 +1,74 @@
-from typing import Dict, Any, List, Tuple
-import heapq
+from typing import Dict, Any, Iterable, Iterator, List, Tuple
+import logging
+from operator import itemgetter
 
-def process_ledger(ledger_2d: List[List[str]]) -> List[Dict[str, str]]:
+logger = logging.getLogger(__name__)
+
+def _parse_number(cell: str) -> int:
+    """Parses a stripped question-number cell; blank or non-numeric cells count as 0."""
+    if cell.isdecimal():
+        return int(cell)
+    if not cell:
+        return 0
+    # Rare: signed values such as "-1" or "+2"
+    try:
+        return int(cell)
+    except ValueError:
+        return 0
+
+def iter_ledger_questions(ledger_rows: Iterable[List[str]]) -> Iterator[Dict[str, Any]]:
     """
-    Returns a priority queue of dictionaries containing question data.
-    Only includes questions where column H is not marked with 'X'.
+    Yields question data for each ledger row, in sheet order, consuming the rows
+    one at a time. Only includes questions where column H is not marked with 'X'.
     """
-    if len(ledger_2d) < 2:
-        return []
-    
-    headers = ledger_2d[1]  # Second row is the header
-    priority_queue = []
+    rows = iter(ledger_rows)
+    next(rows, None)  # Title row
+    headers = next(rows, None)  # Second row is the header
+    if headers is None:
+        return
     
-    # Debug print headers
-    print(f"Headers found: {headers}")
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("Headers found: %s", headers)
     
-    for row_idx, row in enumerate(ledger_2d[2:], start=3):  # Skip header rows, start=3 for 1-based row numbers
-        # Debug print row
-        print(f"Processing row {row_idx}: {row}")
+    for row_idx, row in enumerate(rows, start=3):  # Header rows consumed, start=3 for 1-based row numbers
+        if debug:
+            logger.debug("Processing row %d: %s", row_idx, row)
         
-        # Pad row to match headers length
-        row_padded = row + [''] * (len(headers) - len(row))
+        # Pad row to match headers length, stripping every cell once
+        cells = [cell.strip() for cell in row]
+        cells.extend([''] * (len(headers) - len(cells)))
         
         # Skip if column H (index 7) is marked with 'X'
-        if len(row_padded) > 7 and row_padded[7].strip().upper() == 'X':
-            print(f"Skipping row {row_idx} - marked with X")
+        if len(cells) > 7 and cells[7].upper() == 'X':
+            if debug:
+                logger.debug("Skipping row %d - marked with X", row_idx)
             continue
             
         # Create dictionary with required columns
         question_data = {
-            'number': int(row_padded[1] if row_padded[1].strip() else '0'),  # Column B
-            'operation': row_padded[2].strip(),  # Column C
-            'instance': row_padded[3].strip(),   # Column D
-            'present': row_padded[4].strip(),    # Column E
-            'attachments': row_padded[5].strip(), # Column F
-            'reload_question': row_padded[6].strip().upper() == 'X'  # Column G
+            'number': _parse_number(cells[1]),  # Column B
+            'operation': cells[2],           # Column C
+            'instance': cells[3],            # Column D
+            'present': cells[4],             # Column E
+            'attachments': cells[5],         # Column F
+            'reload_question': cells[6].upper() == 'X'  # Column G
         }
         
-        # Debug print processed data
-        print(f"Processed data for row {row_idx}: {question_data}")
+        if debug:
+            logger.debug("Processed data for row %d: %s", row_idx, question_data)
         
-        # Add to priority queue (using number as priority)
-        heapq.heappush(priority_queue, (question_data['number'], question_data))
-    
-    # Extract just the dictionaries from the priority queue, maintaining order
-    result = [item[1] for item in sorted(priority_queue)]
-    print(f"Final processed questions: {result}")
-    return result
+        yield question_data
 
+def process_ledger(ledger_2d: Iterable[List[str]]) -> List[Dict[str, Any]]:
+    """
+    Returns a priority queue of dictionaries containing question data.
+    Only includes questions where column H is not marked with 'X'.
+    Accepts any iterable of rows (e.g. a generator), not only a full 2D list.
+    """
+    # Sort once by question number; the sort is stable and never compares the
+    # dicts, so rows sharing a number keep their sheet order
+    result = sorted(iter_ledger_questions(ledger_2d), key=itemgetter('number'))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Final processed questions: %s", result)
+    return result
@@ -1,17 +1,29 @@
-from typing import List, Dict, Any
-from src.models.models import call_models
+import logging
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple
+from src.models.models import call_models_concurrently
+from src.utils.json import loads as json_loads
+from src.utils.text import strip_code_fence
 import json
 
+logger = logging.getLogger(__name__)
+
+# Model-string prefix -> generic ledger column name
+_PREFIXES = (("gpt", "GPT"), ("claude", "CLAUDE"), ("gemini", "GEMINI"))
+
+@lru_cache(maxsize=128)
 def get_generic_model_name(model: str) -> str:
     """Convert specific model names to generic ones (e.g., 'gpt-4' -> 'GPT')"""
-    if model.startswith('gpt'):
-        return 'GPT'
-    elif model.startswith('claude'):
-        return 'CLAUDE'
-    elif model.startswith('gemini'):
-        return 'GEMINI'
+    for prefix, generic in _PREFIXES:
+        if model.startswith(prefix):
+            return generic
     return model.upper()
 
+@lru_cache(maxsize=64)
+def _parse_models(active_models: str) -> Tuple[str, ...]:
+    """Splits a present row's comma-separated active_models cell into model names."""
+    return tuple(filter(None, (model.strip() for model in active_models.split(","))))
+
 def format_prompt(input_type: str, prompt: str, prior_results: List[Dict[str, str]] = None) -> str:
     """Format the prompt based on input type and prior results"""
     if input_type == "gsheets":
@@ -38,13 +50,14 @@ def evaluate_row_debug(
     """
     results = []
     for instr_index, instr in enumerate(present):
-        print(f"\n📘 Present Row #{instr_index+1}")
-        print(f"   Input Type: {instr.get('input', 'gsheets')}")
-        print(f"   Active Models: {instr.get('active_models', '')}")
+        logger.debug(
+            "Present row #%d: input type=%s, active models=%s",
+            instr_index + 1, instr.get('input', 'gsheets'), instr.get('active_models', ''),
+        )
 
-        models = [m.strip() for m in instr.get("active_models", "").split(",") if m.strip()]
+        models = _parse_models(instr.get("active_models", ""))
         if not models:
-            print("   ⚠️ No active models specified")
+            logger.warning("Present row #%d: no active models specified", instr_index + 1)
             continue
 
         try:
@@ -54,15 +67,15 @@ def evaluate_row_debug(
                 prompt,
                 results  # Pass previous results for prior model outputs
             )
-            print(f"   Formatted Prompt: {formatted_prompt}")
+            logger.debug("Formatted prompt: %s", formatted_prompt)
 
             # Simulate model calls
             model_results = {}
             for model in models:
-                print(f"\n   🤖 Would call model: {model}")
-                print(f"      With prompt: {formatted_prompt}")
-                print(f"      With question: {prompt}")
-                print(f"      With attachments: {attachments}")
+                logger.debug(
+                    "Would call model %s with prompt=%r, question=%r, attachments=%s",
+                    model, formatted_prompt, prompt, attachments,
+                )
                 
                 # Simulate a response based on the model and prompt
                 generic_name = get_generic_model_name(model)
@@ -72,10 +85,10 @@ def evaluate_row_debug(
             # Convert specific model names to generic ones
             generic_results = {get_generic_model_name(model): output 
                              for model, output in model_results.items()}
-            print(f"   📄 Simulated Results: {generic_results}")
+            logger.debug("Simulated results: %s", generic_results)
             results.append(generic_results)
         except Exception as e:
-            print(f"   ❌ Error in debug mode: {e}")
+            logger.error("Error in debug mode: %s", e)
             results.append({get_generic_model_name(model): f"[Error: {e}]" for model in models})
 
     return results
@@ -92,13 +105,14 @@ def evaluate_row(
     """
     results = []
     for instr_index, instr in enumerate(present):
-        print(f"\n📘 Present Row #{instr_index+1}")
-        print(f"   Input Type: {instr.get('input', 'gsheets')}")
-        print(f"   Active Models: {instr.get('active_models', '')}")
+        logger.debug(
+            "Present row #%d: input type=%s, active models=%s",
+            instr_index + 1, instr.get('input', 'gsheets'), instr.get('active_models', ''),
+        )
 
-        models = [m.strip() for m in instr.get("active_models", "").split(",") if m.strip()]
+        models = _parse_models(instr.get("active_models", ""))
         if not models:
-            print("   ⚠️ No active models specified")
+            logger.warning("Present row #%d: no active models specified", instr_index + 1)
             continue
 
         try:
@@ -108,27 +122,24 @@ def evaluate_row(
                 prompt,
                 results  # Pass previous results for prior model outputs
             )
-            print(f"   Formatted Prompt: {formatted_prompt}")
-
-            # Call each model individually since call_models expects a single model
-            model_results = {}
-            for model in models:
-                response = call_models(
-                    clients=clients,
-                    model_string=model,
-                    prompt=formatted_prompt,
-                    question=prompt,  # Original prompt for context
-                    files=[],
-                )
-                model_results[model] = response
+            logger.debug("Formatted prompt: %s", formatted_prompt)
+
+            # call_models takes a single model, so fan the models out concurrently
+            model_results = call_models_concurrently(
+                clients,
+                models,
+                prompt=formatted_prompt,
+                question=prompt,  # Original prompt for context
+                files=[],
+            )
 
             # Convert specific model names to generic ones
             generic_results = {get_generic_model_name(model): output 
                              for model, output in model_results.items()}
-            print(f"   📄 Results: {generic_results}")
+            logger.debug("Results: %s", generic_results)
             results.append(generic_results)
         except Exception as e:
-            print(f"   ❌ Error evaluating models: {e}")
+            logger.error("Error evaluating models: %s", e)
             results.append({get_generic_model_name(model): f"[Error: {e}]" for model in models})
 
     return results
@@ -141,13 +152,14 @@ def read_input(
     """Read input files and process them according to instructions."""
     results = []
     for instr_index, instr in enumerate(instructions):
-        print(f"\n📘 Present Row #{instr_index+1}")
-        print(f"   Input Type: {instr.get('input', 'gsheets')}")
-        print(f"   Active Models: {instr.get('active_models', '')}")
+        logger.debug(
+            "Present row #%d: input type=%s, active models=%s",
+            instr_index + 1, instr.get('input', 'gsheets'), instr.get('active_models', ''),
+        )
 
-        models = [m.strip() for m in instr.get("active_models", "").split(",") if m.strip()]
+        models = _parse_models(instr.get("active_models", ""))
         if not models:
-            print("   ⚠️ No active models specified")
+            logger.warning("Present row #%d: no active models specified", instr_index + 1)
             continue
 
         try:
@@ -157,28 +169,24 @@ def read_input(
                 instr.get('prompt', ''),
                 results  # Pass previous results for prior model outputs
             )
-            print(f"   Formatted Prompt: {formatted_prompt}")
-
-            # Call each model individually
-            model_results = {}
-            for model in models:
-                response = call_models(
-                    clients=clients,
-                    model_string=model,
-                    prompt=formatted_prompt,
-                    question=instr.get('prompt', ''),
-                    files=input_files,
-                    attachments=[]
-                )
-                model_results[model] = response
+            logger.debug("Formatted prompt: %s", formatted_prompt)
+
+            # Call the models concurrently
+            model_results = call_models_concurrently(
+                clients,
+                models,
+                prompt=formatted_prompt,
+                question=instr.get('prompt', ''),
+                files=input_files,
+            )
 
             # Convert specific model names to generic ones
             generic_results = {get_generic_model_name(model): output 
                              for model, output in model_results.items()}
-            print(f"   📄 Results: {generic_results}")
+            logger.debug("Results: %s", generic_results)
             results.append(generic_results)
         except Exception as e:
-            print(f"   ❌ Error evaluating models: {e}")
+            logger.error("Error evaluating models: %s", e)
             results.append({get_generic_model_name(model): f"[Error: {e}]" for model in models})
 
     return results
@@ -201,15 +209,11 @@ def save_final_output_to_json(results: List[Dict[str, str]], output_path: str =
     model_output = next(iter(final_output.values()))
     
     # Handle markdown code blocks
-    if model_output.startswith("```json"):
-        model_output = model_output.split("```json")[1]
-    if model_output.endswith("```"):
-        model_output = model_output.rsplit("```", 1)[0]
-    model_output = model_output.strip()
+    model_output = strip_code_fence(model_output)
     
     try:
         # Try to parse as JSON first to validate
-        json.loads(model_output)
+        json_loads(model_output)
         # If valid JSON, write directly
         with open(output_path, 'w') as f:
             f.write(model_output)
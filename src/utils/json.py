@@ -1,92 +1,143 @@
-from typing import List, Dict
+from typing import Iterable, List, Dict, Tuple
+import atexit
 import json
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
+from src.constants import MODEL_ORDER
+
+try:
+    import orjson
+except ImportError:  # optional speedup; the stdlib json module is the fallback
+    orjson = None
+
+# Questions being updated, per timestamp: the question list plus the index of
+# the first entry for each question_number. Written to disk by flush_questions()
+# (and for anything left over, at interpreter exit).
+_QUESTION_CACHE: Dict[str, Tuple[List[Dict], Dict[int, int]]] = {}
+
+def _questions_file(timestamp: str) -> Path:
+    return Path("outputs") / f"{timestamp}.json"
+
+@lru_cache(maxsize=256)
+def _clean_flag(cell: str) -> str:
+    """Normalizes a flag cell ('X', ' x', 'x\xa0', ...); the same few values repeat down the ledger."""
+    return (cell or "").replace('\xa0', '').strip().upper()
+
+def loads(data) -> object:
+    """Parses JSON from str or bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dump_to_path(obj: object, path: Path) -> None:
+    """Writes obj as 2-space indented UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
 
-def serialize_ledger_into_json(ledger: List[List[str]], timestamp: str) -> None:
+def serialize_ledger_into_json(ledger: Iterable[List[str]], timestamp: str) -> None:
     """
     Transforms ledger data into a structured JSON format and saves to a timestamped file.
 
     Args:
-        ledger: 2D list of strings representing the ledger data
+        ledger: Ledger rows (a 2D list or any iterable of rows), consumed once
         timestamp: Timestamp string in format "YYYYMMDD_HHMMSS"
     """
-    if len(ledger) < 2:
+    rows = iter(ledger)
+    next(rows, None)  # Title row
+    headers = next(rows, None)
+    if headers is None:
         print("❌ Not enough rows in ledger to process.")
         return
 
-    headers = ledger[1]
-    models = ["CLAUDE", "DEEPSEEK", "GEMINI", "GPT"]
     questions = []
 
-    def clean(cell: str) -> str:
-        return (cell or "").replace('\xa0', '').strip().upper()
+    # From column G (index 6) onward: 4 models per step
+    step_count = max(0, (len(headers) - 6) // 4)
+    tail_width = step_count * 4
+    row_width = 6 + tail_width
 
-    for row in ledger[2:]:
-        question_number = int(row[1]) if len(row) > 1 and row[1].strip().isdigit() else 0
+    for row in rows:
+        # Strip every cell used below once, padding short rows with ""
+        cells = [cell.strip() for cell in row[:row_width]]
+        cells.extend([""] * (row_width - len(cells)))
 
         question = {
-            "question_number": question_number,
-            "question": row[2].strip() if len(row) > 2 else "",
-            "present": row[3].strip() if len(row) > 3 else "",
-            "reload_question": clean(row[4]) == "X" if len(row) > 4 else False,
-            "resolved": clean(row[5]) == "X" if len(row) > 5 else False,
-            "model_outputs": []
+            "question_number": int(cells[1]) if cells[1].isdecimal() else 0,
+            "question": cells[2],
+            "present": cells[3],
+            "reload_question": _clean_flag(cells[4]) == "X",
+            "resolved": _clean_flag(cells[5]) == "X",
         }
 
-        # From column G (index 6) onward: 4 models per step
-        for step in range((len(headers) - 6) // 4):
-            base = 6 + step * 4
-            step_outputs = {
-                model: row[base + i].strip() if base + i < len(row) else ""
-                for i, model in enumerate(models)
-            }
-            question["model_outputs"].append(step_outputs)
+        # Model cells start at column G; slice them into steps
+        tail = cells[6:]
+        question["model_outputs"] = [
+            dict(zip(MODEL_ORDER, tail[i:i + 4])) for i in range(0, tail_width, 4)
+        ]
 
         questions.append(question)
 
-    # Save JSON
-    output_path = Path("outputs") / f"{timestamp}.json"
+    # Save JSON, discarding any unflushed updates for the file it replaces
+    _QUESTION_CACHE.pop(timestamp, None)
+    output_path = _questions_file(timestamp)
     output_path.parent.mkdir(exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(questions, f, indent=2, ensure_ascii=False)
+    dump_to_path(questions, output_path)
 
     print(f"✅ JSON saved to: {output_path}")
 
 
 def update_question_inside_json(question: Dict, timestamp: str) -> None:
     """
-    Updates or inserts a question in the JSON file with the given timestamp.
+    Updates or inserts a question for the JSON file with the given timestamp.
+    
+    The file is read once and updates are kept in memory; call
+    flush_questions(timestamp) before reading the file back.
     
     Args:
-        timestamp: Timestamp string in format "%m/%d/%Y %H:%M:%S" (e.g., "03/15/2024 14:30:22")
+        timestamp: Filesystem-safe timestamp string "YYYYMMDD_HHMMSS"
         question: Dictionary containing the question data to update/insert
     """
-    # Convert timestamp to filesystem-safe format (YYYYMMDD_HHMMSS)
-
-    json_file = Path("outputs") / f"{timestamp}.json"
-    
-    # ✅ Use shared utility to read file
-    questions = read_json_file(json_file) if json_file.exists() else []
-    
-    # Find if question already exists
     question_number = question["question_number"]
-    for i, q in enumerate(questions):
-        if q["question_number"] == question_number:
-            # Update existing question
-            questions[i] = question
-            break
+
+    entry = _QUESTION_CACHE.get(timestamp)
+    if entry is None:
+        json_file = _questions_file(timestamp)
+        questions = read_json_file(json_file) if json_file.exists() else []
+        index = {}
+        for i, q in enumerate(questions):
+            index.setdefault(q["question_number"], i)
+        entry = _QUESTION_CACHE[timestamp] = (questions, index)
+
+    questions, index = entry
+    i = index.get(question_number)
+    if i is not None:
+        # Update existing question
+        questions[i] = question
     else:
         # Insert new question
+        index[question_number] = len(questions)
         questions.append(question)
+
+def flush_questions(timestamp: str) -> None:
+    """Writes the cached questions for timestamp to disk, sorted by question number."""
+    entry = _QUESTION_CACHE.pop(timestamp, None)
+    if entry is None:
+        return
+
+    questions = sorted(entry[0], key=itemgetter("question_number"))
+    json_file = _questions_file(timestamp)
+    dump_to_path(questions, json_file)
     
-    # Sort questions by question number
-    questions.sort(key=lambda x: x["question_number"])
-    
-    # Write back to file
-    with open(json_file, 'w') as f:
-        json.dump(questions, f, indent=2)
-    
-    print(f"✅ Updated question {question_number} in {json_file}")
+    print(f"✅ Updated {len(questions)} questions in {json_file}")
+
+@atexit.register
+def _flush_all_questions() -> None:
+    for timestamp in list(_QUESTION_CACHE):
+        flush_questions(timestamp)
 
 def read_json_file(file_path: Path) -> List[Dict]:
     """
@@ -98,5 +149,4 @@ def read_json_file(file_path: Path) -> List[Dict]:
     Returns:
         List of question dictionaries
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
\ No newline at end of file
+    return loads(Path(file_path).read_bytes())
\ No newline at end of file
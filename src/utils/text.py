@@ -0,0 +1,17 @@
+import re
+
+# A whole string wrapped in a markdown code fence, optionally tagged "json"
+_CODE_FENCE = re.compile(r'^\s*```(?:json)?\s*\n?(.*?)\n?\s*```\s*$', re.DOTALL)
+
+def strip_code_fence(text: str) -> str:
+    """
+    Removes a surrounding markdown code fence (``` or ```json) from model output.
+
+    Args:
+        text: Raw model output
+
+    Returns:
+        The fenced content, or the stripped input if it isn't fenced.
+    """
+    match = _CODE_FENCE.match(text)
+    return match.group(1).strip() if match else text.strip()
@@ -69,13 +69,12 @@ def wait_until_elapsed(start_time: datetime, duration: float = 2.0) -> None:
         start_time (datetime): Reference point in time.
         duration (float): Minimum seconds to wait since start_time.
     """
-    from utils.timer import get_elapsed_time  # Assuming you're following that module path
+    remaining = duration - (datetime.now() - start_time).total_seconds()
+    if remaining > 0:
+        time.sleep(remaining)
 
-    while get_elapsed_time(start_time) < duration:
-        time.sleep(0.05)  # Sleep to prevent busy looping
 
-
-def convert_timestamp_to_safe_format(timestamp: str) -> str:
+def convert_timestamp_to_safe_format(timestamp: Union[datetime, str]) -> str:
     """
     Converts a timestamp to a filesystem-safe format.
     
@@ -88,7 +87,4 @@ def convert_timestamp_to_safe_format(timestamp: str) -> str:
     if isinstance(timestamp, datetime):
         return timestamp.strftime("%Y%m%d_%H%M%S")
     
-    parts = timestamp.split()
-    date_parts = parts[0].split("/")
-    time_parts = parts[1].split(":")
-    return f"{date_parts[2]}{date_parts[0]}{date_parts[1]}_{time_parts[0]}{time_parts[1]}{time_parts[2]}"
\ No newline at end of file
+    return datetime.strptime(timestamp, DEFAULT_DATETIME_FORMAT).strftime("%Y%m%d_%H%M%S")
\ No newline at end of file